@@ -1,3 +1,6 @@
-from .magics import load_ipython_extension
+def load_ipython_extension(ip):
+    # Импорт magics (и IPython-зависимостей) откладывается до %load_ext
+    from .magics import load_ipython_extension as _load
+    _load(ip)
 
 __all__ = ["load_ipython_extension"]
\ No newline at end of file
@@ -0,0 +1,134 @@
+from __future__ import annotations
+from contextvars import ContextVar, Token
+from io import StringIO
+from typing import Any, List, Optional, Set
+import sys
+import threading
+import time
+
+
+class FigureBuffer:
+    """Потокобезопасный буфер артефактов-фигур одного запуска."""
+
+    def __init__(self):
+        self._items: List[Any] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def append(self, item: Any) -> None:
+        with self._lock:
+            self._items.append(item)
+
+    def extend(self, items: List[Any]) -> None:
+        with self._lock:
+            self._items.extend(items)
+
+    def drain(self) -> List[Any]:
+        """Забирает накопленные элементы и очищает буфер."""
+        with self._lock:
+            items, self._items = self._items, []
+        return items
+
+
+class CaptureState:
+    """
+    Состояние захвата одного запуска: stdout/stderr, фигуры и время старта.
+    Активное состояние хранится в ContextVar, поэтому потоки и asyncio-задачи
+    видят только своё.
+    """
+
+    def __init__(self):
+        self.stdout = StringIO()
+        self.stderr = StringIO()
+        self.figures = FigureBuffer()
+        self.fignums: Set[int] = set()
+        self.started = time.time()
+
+    def claim_figure(self, num: int) -> None:
+        with _SCOPED_LOCK:
+            self.fignums.add(num)
+            _SCOPED_FIGNUMS.add(num)
+
+    def release_figures(self) -> None:
+        with _SCOPED_LOCK:
+            _SCOPED_FIGNUMS.difference_update(self.fignums)
+            self.fignums.clear()
+
+
+_CURRENT: ContextVar[Optional[CaptureState]] = ContextVar("autoreport_capture", default=None)
+
+# Фигуры, показанные вне какого-либо запуска (обычные ячейки ноутбука);
+# их забирает ближайший %%autoreport.
+_UNSCOPED_FIGURES = FigureBuffer()
+
+# Номера фигур, созданных внутри активных запусков
+_SCOPED_FIGNUMS: Set[int] = set()
+_SCOPED_LOCK = threading.Lock()
+
+
+def current_capture() -> Optional[CaptureState]:
+    return _CURRENT.get()
+
+
+def current_figure_buffer() -> FigureBuffer:
+    state = _CURRENT.get()
+    return state.figures if state is not None else _UNSCOPED_FIGURES
+
+
+def unscoped_figure_buffer() -> FigureBuffer:
+    return _UNSCOPED_FIGURES
+
+
+def is_scoped_figure(num: int) -> bool:
+    with _SCOPED_LOCK:
+        return num in _SCOPED_FIGNUMS
+
+
+def activate(state: CaptureState) -> Token:
+    _install_stream_proxies()
+    return _CURRENT.set(state)
+
+
+def deactivate(token: Token) -> None:
+    _CURRENT.reset(token)
+
+
+class _ContextStream:
+    """
+    Прокси для sys.stdout/sys.stderr: пишет в буфер активного запуска,
+    а вне запуска — в исходный поток.
+    """
+
+    def __init__(self, fallback, field: str):
+        self._fallback = fallback
+        self._field = field
+
+    def _target(self):
+        state = _CURRENT.get()
+        return getattr(state, self._field) if state is not None else self._fallback
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def writelines(self, lines):
+        return self._target().writelines(lines)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._fallback, name)
+
+
+_STREAMS_LOCK = threading.Lock()
+
+
+def _install_stream_proxies() -> None:
+    with _STREAMS_LOCK:
+        if not isinstance(sys.stdout, _ContextStream):
+            sys.stdout = _ContextStream(sys.stdout, "stdout")
+        if not isinstance(sys.stderr, _ContextStream):
+            sys.stderr = _ContextStream(sys.stderr, "stderr")
@@ -1,13 +1,14 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import List
+from typing import Iterable, List, Optional
 import os
+import uuid
 import matplotlib.pyplot as plt
 import matplotlib.figure
 from ..core.utils import sha256_file
 from ..core.models import Artifact
-
-_GLOBAL_FIG_BUFFER: List[Artifact] = []
+from .context import (CaptureState, current_capture, current_figure_buffer,
+                      unscoped_figure_buffer, is_scoped_figure)
 
 
 class FigureManager:
@@ -20,7 +21,7 @@ class FigureManager:
         (self.cache_dir / "artifacts").mkdir(parents=True, exist_ok=True)
 
     def _save_fig(self, fig, name: str, image_format: str = "png", dpi: int = 150) -> Artifact | None:
-        tmp_path = self.cache_dir / "artifacts" / f"tmp_{name}.{image_format}"
+        tmp_path = self.cache_dir / "artifacts" / f"tmp_{name}_{uuid.uuid4().hex}.{image_format}"
         fig.savefig(tmp_path, dpi=dpi, bbox_inches="tight")
 
         sha = sha256_file(tmp_path)
@@ -48,52 +49,102 @@ class FigureManager:
             size_bytes=final_path.stat().st_size
         )
 
-    def capture_current_figures(self, image_format: str = "png", dpi: int = 150) -> List[Artifact]:
+    def capture_current_figures(self, image_format: str = "png", dpi: int = 150,
+                                fignums: Optional[Iterable[int]] = None) -> List[Artifact]:
         artifacts: List[Artifact] = []
-        for i, num in enumerate(plt.get_fignums(), start=1):
+        nums = plt.get_fignums() if fignums is None else list(fignums)
+        for i, num in enumerate(nums, start=1):
             fig = plt.figure(num)
             art = self._save_fig(fig, f"figure_{i}", image_format, dpi)
             if art:
                 artifacts.append(art)
         return artifacts
 
-try:
-    import builtins
-    import IPython.display as ipd
-
-    _original_display = ipd.display
-
-    def _patched_display(*objs, **kwargs):
-        fm = FigureManager()
-        for obj in objs:
-            if isinstance(obj, matplotlib.figure.Figure):
-                art = fm._save_fig(obj, f"auto_{len(_GLOBAL_FIG_BUFFER)+1}")
-                if art:
-                    _GLOBAL_FIG_BUFFER.append(art)
-        return _original_display(*objs, **kwargs)
-
-    ipd.display = _patched_display
 
-except Exception:
-    pass
-
-import matplotlib
-
-_original_show = matplotlib.pyplot.show
+def collect_figures(state: Optional[CaptureState], claim_unscoped: bool = False) -> List[Artifact]:
+    """
+    Собирает фигуры запуска: открытые фигуры, созданные внутри state, и
+    артефакты из его буфера. При claim_unscoped забирает также фигуры,
+    не принадлежащие ни одному активному запуску (обычные ячейки ноутбука).
+    Буферы при этом очищаются, а собственные фигуры запуска закрываются —
+    иначе после release_figures они стали бы «ничьими» и попали в следующий запуск.
+    """
+    owned = set(state.fignums) if state is not None else set()
+    nums = [n for n in plt.get_fignums()
+            if n in owned or (claim_unscoped and not is_scoped_figure(n))]
+    try:
+        arts_now = FigureManager().capture_current_figures(fignums=nums)
+    finally:
+        for num in owned:
+            plt.close(num)
+    buffered: List[Artifact] = state.figures.drain() if state is not None else []
+    if claim_unscoped:
+        buffered += unscoped_figure_buffer().drain()
+    return list({a.path: a for a in (arts_now + buffered)}.values())
+
+
+_original_show = plt.show
+_original_figure = plt.figure
+_original_display = None
+
+
+def _patched_display(*objs, **kwargs):
+    fm = FigureManager()
+    buffer = current_figure_buffer()
+    for obj in objs:
+        if isinstance(obj, matplotlib.figure.Figure):
+            art = fm._save_fig(obj, f"auto_{len(buffer)+1}")
+            if art:
+                buffer.append(art)
+    return _original_display(*objs, **kwargs)
 
 
 def _patched_show(*args, **kwargs):
     fm = FigureManager()
+    buffer = current_figure_buffer()
+    state = current_capture()
+    # Внутри запуска показываем только его собственные фигуры
+    nums = [n for n in plt.get_fignums()
+            if (n in state.fignums if state is not None else not is_scoped_figure(n))]
     # Сохраняем с именами auto_N для совместимости с tracker.py
     artifacts: List[Artifact] = []
-    for i, num in enumerate(plt.get_fignums(), start=len(_GLOBAL_FIG_BUFFER)+1):
+    for i, num in enumerate(nums, start=len(buffer)+1):
         fig = plt.figure(num)
         art = fm._save_fig(fig, f"auto_{i}", "png", 150)
         if art:
             artifacts.append(art)
     if artifacts:
-        _GLOBAL_FIG_BUFFER.extend(artifacts)
+        buffer.extend(artifacts)
     return _original_show(*args, **kwargs)
 
 
-matplotlib.pyplot.show = _patched_show
+def _patched_figure(*args, **kwargs):
+    before = set(plt.get_fignums())
+    fig = _original_figure(*args, **kwargs)
+    state = current_capture()
+    if state is not None and fig.number not in before:
+        state.claim_figure(fig.number)
+    return fig
+
+
+def install_hooks() -> None:
+    """
+    Подменяет plt.show, plt.figure и IPython.display.display для захвата фигур.
+    Идемпотентна; вызывается при импорте модуля, а расширение импортирует модуль
+    только после того, как пользователь сам импортировал matplotlib.pyplot.
+    """
+    global _original_display
+    if plt.show is not _patched_show:
+        plt.show = _patched_show
+    if plt.figure is not _patched_figure:
+        plt.figure = _patched_figure
+    try:
+        import IPython.display as ipd
+        if ipd.display is not _patched_display:
+            _original_display = ipd.display
+            ipd.display = _patched_display
+    except Exception:
+        pass
+
+
+install_hooks()
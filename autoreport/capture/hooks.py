@@ -0,0 +1,71 @@
+from __future__ import annotations
+from types import ModuleType
+from typing import Callable, Dict, List
+import importlib.abc
+import sys
+import threading
+
+_CALLBACKS: Dict[str, List[Callable[[ModuleType], None]]] = {}
+_LOCK = threading.RLock()
+
+
+def _fire(fullname: str) -> None:
+    with _LOCK:
+        callbacks = _CALLBACKS.pop(fullname, [])
+    module = sys.modules.get(fullname)
+    for callback in callbacks:
+        try:
+            callback(module)
+        except Exception:
+            # хук не должен ломать пользовательский import
+            pass
+
+
+class _PostImportFinder(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder, который ничего не загружает сам: находит spec остальными
+    finder'ами и оборачивает exec_module, чтобы после загрузки модуля вызвать
+    зарегистрированные колбэки.
+    """
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in _CALLBACKS:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+        if loader is None or not hasattr(loader, "exec_module"):
+            return spec
+        original_exec = loader.exec_module
+
+        def exec_module(module):
+            original_exec(module)
+            _fire(fullname)
+
+        loader.exec_module = exec_module
+        return spec
+
+
+_FINDER = _PostImportFinder()
+
+
+def on_import(fullname: str, callback: Callable[[ModuleType], None]) -> None:
+    """
+    Вызывает callback(module), как только модуль fullname будет импортирован.
+    Если модуль уже загружен — вызывает сразу.
+    """
+    with _LOCK:
+        module = sys.modules.get(fullname)
+        if module is None:
+            _CALLBACKS.setdefault(fullname, []).append(callback)
+            if _FINDER not in sys.meta_path:
+                sys.meta_path.insert(0, _FINDER)
+            return
+    callback(module)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import math
+import os
+import time
+import warnings
+import numpy as np
+from ..core.utils import fingerprint as data_fingerprint
+
+# Сколько строк берём в выборку для статистик и гистограмм
+SAMPLE_ROWS = 100_000
+# Сколько колонок обрабатывает одна задача пула
+_CHUNK_COLS = 16
+_CACHE_SIZE = 64
+
+_PROFILE_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def _is_frame(obj: Any) -> bool:
+    return hasattr(obj, "iloc") and hasattr(obj, "columns") and hasattr(obj, "dtypes")
+
+
+def _is_series(obj: Any) -> bool:
+    return hasattr(obj, "iloc") and hasattr(obj, "to_frame")
+
+
+def _sample_index(n_rows: int, sample_rows: int) -> Optional[np.ndarray]:
+    if n_rows <= sample_rows:
+        return None
+    rng = np.random.default_rng(0)
+    return np.sort(rng.choice(n_rows, size=sample_rows, replace=False))
+
+
+def _to_columns(obj: Any, sample_rows: int) -> Tuple[str, Tuple[int, ...], List[Tuple[str, str]], int, Any]:
+    """
+    Метаданные колонок и ленивая выборка: (kind, shape, [(name, dtype)], sampled_rows, take).
+    take(start, stop) возвращает [(name, dtype, values)] для колонок [start, stop) по
+    выборке строк — строки копируются только для тех групп колонок, до которых дошла очередь.
+    """
+    kind = type(obj).__name__
+    if _is_series(obj):
+        obj = obj.to_frame()
+    if _is_frame(obj):
+        idx = _sample_index(len(obj), sample_rows)
+        meta = [(str(c), str(t)) for c, t in zip(obj.columns, obj.dtypes)]
+
+        def take_frame(start: int, stop: int) -> List[Tuple[str, str, Any]]:
+            # сначала срез колонок (view), затем строки — иначе pandas копирует строки всего блока
+            part = obj.iloc[:, start:stop]
+            part = part if idx is None else part.iloc[idx]
+            return [(name, dtype, part.iloc[:, j]) for j, (name, dtype) in enumerate(meta[start:stop])]
+
+        return kind, tuple(obj.shape), meta, len(obj) if idx is None else len(idx), take_frame
+
+    arr = np.asarray(obj)
+    if arr.ndim == 0 or arr.ndim > 2:
+        return kind, tuple(arr.shape), [], 0, None
+    idx = _sample_index(arr.shape[0], sample_rows)
+    sampled_rows = arr.shape[0] if idx is None else len(idx)
+    if arr.ndim == 1:
+        meta = [("value", str(arr.dtype))]
+        block = arr[:, None]
+    else:
+        meta = [(f"col_{j}", str(arr.dtype)) for j in range(arr.shape[1])]
+        block = arr
+
+    def take_array(start: int, stop: int) -> List[Tuple[str, str, Any]]:
+        part = block[:, start:stop] if idx is None else block[idx, start:stop]
+        return [(name, dtype, part[:, j]) for j, (name, dtype) in enumerate(meta[start:stop])]
+
+    return kind, tuple(arr.shape), meta, sampled_rows, take_array
+
+
+def _numeric_values(values: Any) -> Optional[np.ndarray]:
+    dtype = getattr(values, "dtype", None)
+    if dtype is None or getattr(dtype, "kind", "O") not in "biuf":
+        return None
+    if hasattr(values, "to_numpy"):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.asarray(values, dtype=np.float64)
+
+
+def _finite(x: float) -> Optional[float]:
+    x = float(x)
+    return x if math.isfinite(x) else None
+
+
+def _profile_chunk(take: Any, start: int, stop: int, bins: int) -> List[Dict[str, Any]]:
+    """Профиль колонок [start, stop); числовые колонки считаются одной векторной операцией."""
+    columns = take(start, stop)
+    numeric: List[Tuple[int, np.ndarray]] = []
+    result: List[Dict[str, Any]] = []
+    for i, (name, dtype, values) in enumerate(columns):
+        col: Dict[str, Any] = {"name": name, "dtype": dtype, "numeric": False}
+        num = _numeric_values(values)
+        if num is not None:
+            col["numeric"] = True
+            numeric.append((i, num))
+        else:
+            if hasattr(values, "isna"):
+                missing = values.isna().to_numpy()
+                present = values.dropna().to_numpy()
+            else:
+                missing = np.array([v is None or (isinstance(v, float) and v != v) for v in values], dtype=bool)
+                present = np.asarray(values)[~missing]
+            col["missing"] = float(missing.mean()) if len(missing) else 0.0
+            try:
+                col["n_unique"] = len(set(present.tolist()))
+            except TypeError:
+                col["n_unique"] = None
+        result.append(col)
+
+    if numeric:
+        block = np.column_stack([v for _, v in numeric])
+        nan_mask = np.isnan(block)
+        missing = nan_mask.mean(axis=0) if block.shape[0] else np.zeros(block.shape[1])
+        # полностью пустые колонки дают RuntimeWarning "All-NaN slice" — это ожидаемо
+        with np.errstate(all="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            mean = np.nanmean(block, axis=0)
+            std = np.nanstd(block, axis=0)
+            qs = np.nanpercentile(block, [0, 25, 50, 75, 100], axis=0)
+        for j, (i, values) in enumerate(numeric):
+            col = result[i]
+            col["missing"] = float(missing[j])
+            col["stats"] = {
+                "mean": _finite(mean[j]), "std": _finite(std[j]),
+                "min": _finite(qs[0, j]), "p25": _finite(qs[1, j]), "p50": _finite(qs[2, j]),
+                "p75": _finite(qs[3, j]), "max": _finite(qs[4, j]),
+            }
+            finite = values[np.isfinite(values)]
+            if finite.size:
+                counts, edges = np.histogram(finite, bins=bins)
+                col["hist"] = {"counts": counts.tolist(), "edges": [float(e) for e in edges]}
+    return result
+
+
+def profile_data(obj: Any, sample_rows: int = SAMPLE_ROWS, bins: int = 20,
+                 time_budget_s: float = 2.0, max_workers: Optional[int] = None,
+                 fingerprint: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Профиль DataFrame/Series/ndarray: форма, dtypes, доля пропусков, статистики и гистограммы.
+    Статистики считаются по случайной выборке из sample_rows строк, колонки
+    обрабатываются группами в пуле потоков (numpy отпускает GIL) волнами по
+    max_workers групп; строки выборки копируются внутри групп. Бюджет времени
+    (включая отпечаток) проверяется между волнами: начатая волна дорабатывает,
+    новые не запускаются, а профиль возвращается частичным (truncated=True) —
+    у необработанных колонок есть только имя и dtype.
+    Результат (в т.ч. частичный) кэшируется по отпечатку данных; уже посчитанный
+    отпечаток можно передать через fingerprint.
+    """
+    if not getattr(obj, "shape", None):
+        return None
+    start = time.perf_counter()
+    if fingerprint is None:
+        fingerprint = data_fingerprint(obj)
+    if fingerprint is None:
+        return None
+    cached = _PROFILE_CACHE.get(fingerprint)
+    if cached is not None:
+        _PROFILE_CACHE.move_to_end(fingerprint)
+        return cached
+
+    kind, shape, columns, sampled_rows, take = _to_columns(obj, sample_rows)
+    # Имя и dtype известны из метаданных для всех колонок, даже если до них не дойдёт очередь
+    profiled: List[Dict[str, Any]] = [
+        {"name": name, "dtype": dtype, "numeric": False, "missing": None, "skipped": True}
+        for name, dtype in columns
+    ]
+    offsets = list(range(0, len(columns), _CHUNK_COLS))
+
+    truncated = False
+    if offsets:
+        workers = max_workers or min(len(offsets), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for w in range(0, len(offsets), workers):
+                if time.perf_counter() - start > time_budget_s:
+                    truncated = True
+                    break
+                wave = offsets[w:w + workers]
+                futures = [pool.submit(_profile_chunk, take, i, min(i + _CHUNK_COLS, len(columns)), bins)
+                           for i in wave]
+                for i, fut in zip(wave, futures):
+                    if fut.exception() is None:
+                        profiled[i:i + _CHUNK_COLS] = fut.result()
+
+    profile = {
+        "kind": kind,
+        "shape": list(shape),
+        "n_rows": shape[0] if shape else 0,
+        "n_cols": len(columns),
+        "sampled_rows": sampled_rows,
+        "sampled": bool(shape) and sampled_rows < shape[0],
+        "columns": profiled,
+        "truncated": truncated,
+        "elapsed_s": round(time.perf_counter() - start, 4),
+    }
+    # Частичный профиль тоже кэшируется: иначе каждый отчёт заново упирался бы в бюджет
+    _PROFILE_CACHE[fingerprint] = profile
+    while len(_PROFILE_CACHE) > _CACHE_SIZE:
+        _PROFILE_CACHE.popitem(last=False)
+    return profile
+
+
+def profile_namespace(namespace: Dict[str, Any], names: List[str], time_budget_s: float = 5.0,
+                      fingerprints: Optional[Dict[str, Optional[str]]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Профили переменных names из namespace в пределах общего бюджета времени.
+    fingerprints — уже посчитанные отпечатки переменных, чтобы не хэшировать данные повторно.
+    """
+    fingerprints = fingerprints or {}
+    deadline = time.perf_counter() + time_budget_s
+    profiles: Dict[str, Dict[str, Any]] = {}
+    for name in names:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        try:
+            profile = profile_data(namespace[name], time_budget_s=remaining,
+                                   fingerprint=fingerprints.get(name))
+        except Exception:
+            continue
+        if profile is not None:
+            profiles[name] = profile
+    return profiles
@@ -1,34 +1,39 @@
-from contextlib import redirect_stdout, redirect_stderr
-from io import StringIO
 import time
-from typing import List
+from typing import List, Optional
+from .context import CaptureState, activate, deactivate
 
 
 class RuntimeCapture:
+    """
+    Захват stdout/stderr, фигур и времени выполнения одного запуска.
+    Состояние привязано к текущему контексту (поток / asyncio-задача), поэтому
+    параллельные запуски в одном процессе не смешивают артефакты.
+    claim_unscoped=True дополнительно забирает фигуры, созданные вне запусков
+    (используется %%autoreport для всего ноутбука).
+    """
+
+    def __init__(self, claim_unscoped: bool = False):
+        self.claim_unscoped = claim_unscoped
+        self.state: Optional[CaptureState] = None
+
     def __enter__(self):
-        self._stdout = StringIO()
-        self._stderr = StringIO()
-        self._start = time.time()
-        self._ctx_out = redirect_stdout(self._stdout)
-        self._ctx_err = redirect_stderr(self._stderr)
-        self._ctx_out.__enter__()
-        self._ctx_err.__enter__()
+        self.state = CaptureState()
+        self._token = activate(self.state)
         self.artifacts: List = []
         return self
 
     def __exit__(self, exc_type, exc, tb):
-        self._ctx_err.__exit__(exc_type, exc, tb)
-        self._ctx_out.__exit__(exc_type, exc, tb)
-        self.duration_s = time.time() - self._start
-        self.stdout = self._stdout.getvalue()
-        self.stderr = self._stderr.getvalue()
+        state = self.state
+        deactivate(self._token)
+        self.duration_s = time.time() - state.started
+        self.stdout = state.stdout.getvalue()
+        self.stderr = state.stderr.getvalue()
         self.error = None if exc is None else f"{exc_type.__name__}: {exc}"
 
         try:
-            from .figures import FigureManager, _GLOBAL_FIG_BUFFER
-            fm = FigureManager()
-            arts_now = fm.capture_current_figures()
-            all_arts = list({_a.path: _a for _a in (arts_now + _GLOBAL_FIG_BUFFER)}.values())
-            self.artifacts = all_arts
+            from .figures import collect_figures
+            self.artifacts = collect_figures(state, claim_unscoped=self.claim_unscoped)
         except Exception:
             self.artifacts = []
+        finally:
+            state.release_figures()
@@ -1,6 +1,5 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 import inspect
-import matplotlib.pyplot as plt
 
 def discover_models_and_data(namespace: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
     """
@@ -40,3 +39,24 @@ def discover_models_and_data(namespace: Dict[str, Any]) -> Dict[str, Dict[str, s
         mapping[art_key] = {"model": mname, "data": data_found}
 
     return mapping
+
+
+def discover_data_variables(namespace: Dict[str, Any]) -> List[str]:
+    """
+    Имена переменных с данными (DataFrame/Series/ndarray), связанных с моделями:
+    те же эвристики X/y/X_train/<model>_X, что и в discover_models_and_data.
+    """
+    names = [info["data"] for info in discover_models_and_data(namespace).values() if info["data"]]
+    models = [k for k, v in namespace.items() if hasattr(v, "predict") and not inspect.isclass(v)]
+    for mname in models:
+        names += [f"{mname}_X", f"{mname}_y", f"{mname}_data", f"{mname}_X_train", f"{mname}_y_train"]
+    names += ["X", "y", "X_train", "y_train", "X_test", "y_test"]
+
+    found: List[str] = []
+    for name in names:
+        value = namespace.get(name)
+        if name in found or value is None or hasattr(value, "predict") or inspect.isclass(value):
+            continue
+        if getattr(value, "shape", None):
+            found.append(name)
+    return found
@@ -0,0 +1,33 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Optional
+import typer
+
+app = typer.Typer(help="AutoMLReportGen: работа с экспортированными запусками.")
+
+
+@app.callback()
+def main():
+    """AutoMLReportGen CLI."""
+
+
+@app.command()
+def serve(
+    export_dir: Path = typer.Option(Path("export"), "--export-dir", help="Каталог с run.json"),
+    host: str = typer.Option("127.0.0.1", help="Адрес для прослушивания"),
+    port: int = typer.Option(8000, help="Порт"),
+    template: str = typer.Option("default.html.j2", help="Шаблон отчёта"),
+    cache_size: int = typer.Option(128, help="Сколько отрендеренных отчётов держать в памяти"),
+    base_dir: Optional[Path] = typer.Option(
+        None, "--base-dir",
+        help="Каталог, от которого записаны пути артефактов (по умолчанию — родитель export-каталога)",
+    ),
+):
+    """Локальный сервер отчётов: рендерит запуски из export-каталога по запросу."""
+    from .server import serve as _serve
+    _serve(export_dir, host=host, port=port, template_name=template, cache_size=cache_size,
+           base_dir=base_dir)
+
+
+def run():
+    app()
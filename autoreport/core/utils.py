@@ -1,6 +1,7 @@
 import hashlib
+import weakref
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 def sha256_file(path: Path) -> Optional[str]:
     try:
@@ -25,4 +26,213 @@ def normalize_context(context: dict) -> dict:
         for art in run["artifacts"]:
             if isinstance(art.get("path"), Path):
                 art["path"] = art["path"].as_posix()
-    return context
\ No newline at end of file
+    return context
+
+# Буферы до этого размера хэшируются целиком, крупнее — выборочно
+FINGERPRINT_FULL_BYTES = 16 * 1024 * 1024
+_SAMPLE_CHUNKS = 256
+_CHUNK_BYTES = 64 * 1024
+# Минимальная доля бюджета на одну колонку широкой таблицы
+_MIN_COLUMN_BYTES = 4 * 1024
+_MAX_DEPTH = 6
+# Сколько равномерно расположенных элементов объекта (на все колонки вместе) входит в его версию
+_VERSION_SAMPLE = 65536
+
+# id(obj) -> (weakref на объект, версия, отпечаток)
+_FP_CACHE: Dict[int, Tuple[Any, Any, str]] = {}
+
+
+def _hash_buffer(h, buf: memoryview, max_bytes: int) -> None:
+    # memoryview-срезы не копируют данные: хэшируем буфер объекта напрямую
+    n = buf.nbytes
+    h.update(f"|{n}|".encode("utf-8"))
+    if n <= max_bytes:
+        h.update(buf)
+        return
+    # Выборка: _SAMPLE_CHUNKS кусков, равномерно от начала до конца буфера, всего не больше max_bytes
+    chunk = min(_CHUNK_BYTES, max(1, max_bytes // _SAMPLE_CHUNKS))
+    span = n - chunk
+    for k in range(_SAMPLE_CHUNKS):
+        off = span * k // (_SAMPLE_CHUNKS - 1)
+        h.update(buf[off:off + chunk])
+
+
+def _hash_array(h, arr, max_bytes: int) -> None:
+    import numpy as np
+    h.update(f"ndarray|{arr.dtype.str}|{arr.shape}".encode("utf-8"))
+    if arr.dtype.hasobject:
+        step = max(1, arr.shape[0] // 1024) if arr.ndim else 1
+        h.update(repr(arr[::step].tolist() if arr.ndim else arr.item()).encode("utf-8"))
+        return
+    if not arr.flags.c_contiguous:
+        if arr.ndim and arr.nbytes > max_bytes:
+            # копируем только выбранные строки, а не весь массив
+            arr = arr[::-(-arr.nbytes // max_bytes)]
+        arr = np.ascontiguousarray(arr)
+    _hash_buffer(h, memoryview(arr.reshape(-1).view(np.uint8)), max_bytes)
+
+
+def _is_frame_like(obj: Any) -> bool:
+    return hasattr(obj, "iloc") and hasattr(obj, "dtypes") and hasattr(obj, "index")
+
+
+def _frame_columns(obj: Any):
+    """
+    Колонки DataFrame/Series как массивы: numpy-колонки — без копирования,
+    прочие (строки, категории, nullable) — выборкой ~4096 строк, чтобы не
+    материализовать весь столбец.
+    """
+    import numpy as np
+    frame = obj.to_frame() if hasattr(obj, "to_frame") else obj
+    step = max(1, len(frame) // 4096)
+    for name in frame.columns:
+        col = frame[name]
+        if isinstance(col.dtype, np.dtype) and not col.dtype.hasobject:
+            yield str(name), str(col.dtype), col.to_numpy()
+        else:
+            yield str(name), str(col.dtype), col.iloc[::step].to_numpy()
+
+
+def _n_columns(obj: Any) -> int:
+    shape = getattr(obj, "shape", ())
+    return max(1, shape[1]) if len(shape) > 1 else 1
+
+
+def _index_token(obj: Any) -> str:
+    index = obj.index
+    if type(index).__name__ == "RangeIndex":
+        return repr(index)
+    step = max(1, len(index) // 4096)
+    return repr(index[::step].tolist())
+
+
+def _hash_value(h, obj: Any, max_bytes: int, depth: int = 0) -> bool:
+    """Добавляет объект в хэш; False — если объект не поддерживается."""
+    if depth > _MAX_DEPTH:
+        h.update(f"<{type(obj).__name__}>".encode("utf-8"))
+        return True
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        h.update(f"{type(obj).__name__}:{obj!r}|".encode("utf-8"))
+        return True
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        _hash_buffer(h, memoryview(obj).cast("B"), max_bytes)
+        return True
+    if _is_frame_like(obj):
+        h.update(f"{type(obj).__name__}|{obj.shape}|{_index_token(obj)}|".encode("utf-8"))
+        # max_bytes — бюджет на всю таблицу, а не на каждую колонку
+        column_bytes = max(_MIN_COLUMN_BYTES, max_bytes // _n_columns(obj))
+        for name, dtype, values in _frame_columns(obj):
+            h.update(f"{name}:{dtype}|".encode("utf-8"))
+            _hash_array(h, values, column_bytes)
+        return True
+    if hasattr(obj, "__array_interface__") or type(obj).__module__ == "numpy":
+        import numpy as np
+        _hash_array(h, np.asarray(obj), max_bytes)
+        return True
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        items = sorted(obj, key=repr) if isinstance(obj, (set, frozenset)) else obj
+        h.update(f"{type(obj).__name__}[{len(items)}]".encode("utf-8"))
+        return all(_hash_value(h, x, max_bytes, depth + 1) for x in items)
+    if isinstance(obj, dict):
+        h.update(f"dict[{len(obj)}]".encode("utf-8"))
+        for k in sorted(obj, key=repr):
+            h.update(repr(k).encode("utf-8"))
+            if not _hash_value(h, obj[k], max_bytes, depth + 1):
+                return False
+        return True
+    if hasattr(obj, "get_params"):
+        # Модель: гиперпараметры + обученное состояние (атрибуты вида coef_, estimators_)
+        h.update(f"model|{type(obj).__module__}.{type(obj).__qualname__}|".encode("utf-8"))
+        try:
+            params = obj.get_params(deep=False)
+        except Exception:
+            params = {}
+        fitted = {k: v for k, v in vars(obj).items() if k.endswith("_") and not k.startswith("_")}
+        return _hash_value(h, params, max_bytes, depth + 1) and _hash_value(h, fitted, max_bytes, depth + 1)
+    getstate = getattr(obj, "__getstate__", None)
+    if callable(getstate):
+        # Прочие объекты (например, sklearn Tree) — по их сериализуемому состоянию
+        try:
+            state = getstate()
+        except Exception:
+            return False
+        if state is not None and state is not obj:
+            h.update(f"{type(obj).__module__}.{type(obj).__qualname__}|".encode("utf-8"))
+            return _hash_value(h, state, max_bytes, depth + 1)
+    return False
+
+
+def _buffer_nbytes(obj: Any) -> Optional[int]:
+    """Объём данных массива или DataFrame/Series; None — для прочих объектов."""
+    if _is_frame_like(obj):
+        return sum(values.nbytes for _, _, values in _frame_columns(obj))
+    if hasattr(obj, "__array_interface__") and hasattr(obj, "dtype"):
+        import numpy as np
+        return np.asarray(obj).nbytes
+    return None
+
+
+def _version(obj: Any, sample_size: int = _VERSION_SAMPLE) -> Any:
+    """
+    Дешёвый признак изменения объекта: форма, dtype, адрес буфера и до sample_size
+    равномерно выбранных элементов (небольшие массивы, например coef_, — целиком).
+    У таблицы выборка делится между колонками.
+    """
+    if hasattr(obj, "__array_interface__") and hasattr(obj, "dtype"):
+        import numpy as np
+        arr = np.asarray(obj)
+        sample = b""
+        if arr.size and not arr.dtype.hasobject:
+            idx = np.linspace(0, arr.size - 1, num=min(arr.size, sample_size), dtype=np.intp)
+            # flat-индексация копирует только выбранные элементы при любой раскладке памяти
+            sample = (arr.reshape(-1)[idx] if arr.flags.c_contiguous else arr.flat[idx]).tobytes()
+        return (arr.shape, arr.dtype.str, arr.__array_interface__["data"][0], arr.strides, sample)
+    if _is_frame_like(obj):
+        per_column = max(16, sample_size // _n_columns(obj))
+        return (obj.shape, tuple((name, dtype, _version(values, per_column))
+                                 for name, dtype, values in _frame_columns(obj)))
+    if hasattr(obj, "get_params"):
+        try:
+            params = repr(sorted(obj.get_params(deep=False).items(), key=lambda kv: kv[0]))
+        except Exception:
+            params = ""
+        fitted = tuple((k, id(v), _version(v)) for k, v in vars(obj).items()
+                       if k.endswith("_") and not k.startswith("_"))
+        return (params, fitted)
+    return None
+
+
+def fingerprint(obj: Any, max_bytes: int = FINGERPRINT_FULL_BYTES) -> Optional[str]:
+    """
+    Быстрый отпечаток массива, DataFrame/Series или модели (гиперпараметры + обученное состояние).
+    Буферы хэшируются без копирования через buffer protocol; буферы крупнее max_bytes —
+    выборочно (равномерно расположенные куски), поэтому стоимость ограничена. У таблицы
+    max_bytes делится между колонками (не меньше _MIN_COLUMN_BYTES на колонку).
+    Массивы и таблицы до max_bytes каждый раз хэшируются заново (это дёшево и ловит любую
+    правку на месте). Более крупные и модели кэшируются по идентичности объекта и его
+    версии (форма, dtype, адрес буфера, выборка элементов); правка крупного массива
+    мимо выборки версии может вернуть прежний отпечаток.
+    Для неподдерживаемых объектов возвращает None.
+    """
+    nbytes = _buffer_nbytes(obj)
+    version = None if nbytes is not None and nbytes <= max_bytes else _version(obj)
+    key = id(obj)
+    cached = _FP_CACHE.get(key)
+    if cached is not None and cached[0]() is obj and cached[1] == version:
+        return cached[2]
+
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        if not _hash_value(h, obj, max_bytes):
+            return None
+    except Exception:
+        return None
+    digest = h.hexdigest()
+
+    if version is not None:
+        try:
+            ref = weakref.ref(obj, lambda r, k=key: _FP_CACHE.pop(k, None) if _FP_CACHE.get(k, (None,))[0] is r else None)
+        except TypeError:
+            return digest
+        _FP_CACHE[key] = (ref, version, digest)
+    return digest
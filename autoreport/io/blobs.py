@@ -0,0 +1,95 @@
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+import hashlib
+import os
+import re
+import threading
+import uuid
+import zlib
+
+# Граница ячейки в объединённом коде (см. magics.py: "# === Cell N ===")
+_CELL_SPLIT_RE = re.compile(r"(?m)^(?=# === Cell \d+ ===$)")
+
+
+def split_cells(code: str) -> List[str]:
+    """
+    Делит объединённый код ноутбука на фрагменты по маркерам ячеек.
+    Склейка фрагментов через "".join(...) даёт исходную строку без изменений.
+    """
+    return [part for part in _CELL_SPLIT_RE.split(code) if part]
+
+
+class BlobStore:
+    """
+    Контентно-адресуемое хранилище сжатых текстовых блобов.
+    Блоб лежит в <root>/<sha[:2]>/<sha>.z, где sha — sha256 несжатого содержимого,
+    поэтому одинаковые тексты (например, неизменённые ячейки) хранятся один раз.
+    """
+
+    def __init__(self, root: Path, level: int = 6, max_cache_chars: int = 16 * 1024 * 1024):
+        self.root = root
+        self.level = level
+        # LRU прочитанных блобов, ограниченный суммарной длиной текстов
+        self.max_cache_chars = max_cache_chars
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_chars = 0
+        self._lock = threading.Lock()
+
+    def _path(self, sha: str) -> Path:
+        return self.root / sha[:2] / f"{sha}.z"
+
+    def put(self, text: str) -> Optional[str]:
+        if not text:
+            return None
+        raw = text.encode("utf-8")
+        sha = hashlib.sha256(raw).hexdigest()
+        final_path = self._path(sha)
+        if not final_path.exists():
+            final_path.parent.mkdir(parents=True, exist_ok=True)
+            # Уникальное имя: одинаковый блоб могут писать несколько потоков/процессов
+            tmp_path = final_path.with_name(f"tmp_{uuid.uuid4().hex}.z")
+            tmp_path.write_bytes(zlib.compress(raw, self.level))
+            try:
+                os.replace(tmp_path, final_path)
+            except OSError:
+                tmp_path.unlink(missing_ok=True)
+                if not final_path.exists():
+                    raise
+        return sha
+
+    def get(self, sha: Optional[str]) -> str:
+        if not sha:
+            return ""
+        with self._lock:
+            text = self._cache.get(sha)
+            if text is not None:
+                self._cache.move_to_end(sha)
+                return text
+        text = zlib.decompress(self._path(sha).read_bytes()).decode("utf-8")
+        self._remember(sha, text)
+        return text
+
+    def _remember(self, sha: str, text: str) -> None:
+        if len(text) > self.max_cache_chars:
+            return
+        with self._lock:
+            if sha in self._cache:
+                return
+            self._cache[sha] = text
+            self._cache_chars += len(text)
+            while self._cache_chars > self.max_cache_chars:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_chars -= len(evicted)
+
+    def put_code(self, code: str) -> List[str]:
+        refs: List[str] = []
+        for part in split_cells(code):
+            sha = self.put(part)
+            if sha:
+                refs.append(sha)
+        return refs
+
+    def get_code(self, refs: List[str]) -> str:
+        return "".join(self.get(sha) for sha in refs)
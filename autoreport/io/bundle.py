@@ -1,7 +1,7 @@
 from __future__ import annotations
 from pathlib import Path
 import shutil
-from typing import List
+from typing import Iterable, List
 
 
 def assemble_bundle(report_dir: Path, artifacts: list, mode: str = "copy"):
@@ -10,7 +10,8 @@ def assemble_bundle(report_dir: Path, artifacts: list, mode: str = "copy"):
     updated = []
     for art in artifacts:
         # art может быть pydantic-моделью или dict — приведём к dict
-        art_dict = art if isinstance(art, dict) else art.model_dump()
+        # (dict копируем: он может быть общим с данными экспорта)
+        art_dict = dict(art) if isinstance(art, dict) else art.model_dump(mode="json")
         src = Path(art_dict["path"])
         dst = assets / src.name
 
@@ -30,3 +31,32 @@ def assemble_bundle(report_dir: Path, artifacts: list, mode: str = "copy"):
         updated.append(art_dict)
     return updated
 
+
+def link_artifacts(artifacts: list) -> list:
+    """
+    Как assemble_bundle, но без копирования: только переписывает пути на
+    assets/<имя файла> (файлы отдаются напрямую из кэша, например сервером).
+    """
+    updated = []
+    for art in artifacts:
+        art_dict = dict(art) if isinstance(art, dict) else art.model_dump(mode="json")
+        art_dict["path"] = str(Path("assets") / Path(art_dict["path"]).name)
+        updated.append(art_dict)
+    return updated
+
+
+def prune_bundle(report_dir: Path, keep: Iterable[str]) -> int:
+    """
+    Удаляет из report_dir/assets файлы, на которые отчёт больше не ссылается
+    (нужно при перезаписи одного и того же отчёта). Возвращает число удалённых файлов.
+    """
+    assets = report_dir / "assets"
+    if not assets.is_dir():
+        return 0
+    keep = {Path(p).name for p in keep}
+    removed = 0
+    for path in assets.iterdir():
+        if path.name not in keep and (path.is_file() or path.is_symlink()):
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
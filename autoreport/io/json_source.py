@@ -1,20 +1,88 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 import json
-from ..core.models import Run, ExperimentSet
+from ..core.models import Run, ExperimentSet, Metric, MetricSeries, Artifact
+from .blobs import BlobStore
 
-def load_experiment_set(export_dir: Path) -> ExperimentSet:
+# Крупные текстовые поля Run, которые хранятся в блобах, а не в run.json
+_TEXT_FIELDS = ("stdout", "stderr")
+
+
+def _blob_store(export_dir: Path) -> BlobStore:
+    return BlobStore(export_dir / "blobs")
+
+
+def _resolve_blobs(data: Dict[str, Any], store: BlobStore) -> Dict[str, Any]:
+    refs = data.pop("blobs", None)
+    if refs:
+        data["code"] = store.get_code(refs.get("code") or [])
+        for field in _TEXT_FIELDS:
+            data[field] = store.get(refs.get(field))
+    return data
+
+
+def run_to_dict(run: Run) -> Dict[str, Any]:
+    """
+    Единственная сериализация Run: JSON-совместимый dict, который используется
+    и для экспорта (save_run), и как контекст рендеринга.
+    """
+    return run.model_dump(mode="json")
+
+
+def _construct_run(data: Dict[str, Any]) -> Run:
+    # Сборка Run без валидации — только для файлов, записанных save_run
+    data["metrics"] = {k: Metric.model_construct(**v) for k, v in (data.get("metrics") or {}).items()}
+    data["series"] = {k: MetricSeries.model_construct(**v) for k, v in (data.get("series") or {}).items()}
+    data["artifacts"] = [Artifact.model_construct(**a) for a in (data.get("artifacts") or [])]
+    started_at = data.get("started_at")
+    if isinstance(started_at, str):
+        data["started_at"] = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
+    return Run.model_construct(**data)
+
+
+def load_run_dict(run_dir: Path, store: Optional[BlobStore] = None) -> Dict[str, Any]:
+    """Читает run.json как dict (ссылки на блобы уже разрешены), без создания моделей."""
+    store = store or _blob_store(run_dir.parent)
+    return _resolve_blobs(json.loads((run_dir / "run.json").read_bytes()), store)
+
+
+def load_run(run_dir: Path, store: Optional[BlobStore] = None, trusted: bool = False) -> Run:
+    """
+    trusted=True пропускает pydantic-валидацию; используйте только для
+    export-директорий, записанных save_run.
+    """
+    data = load_run_dict(run_dir, store)
+    return _construct_run(data) if trusted else Run(**data)
+
+
+def load_experiment_set(export_dir: Path, trusted: bool = False) -> ExperimentSet:
     runs: List[Run] = []
+    store = _blob_store(export_dir)
     for run_dir in export_dir.glob("*"):
-        run_json = run_dir / "run.json"
-        if run_json.exists():
-            data = json.loads(run_json.read_text(encoding="utf-8"))
-            runs.append(Run(**data))
-    return ExperimentSet(runs=runs)
+        if (run_dir / "run.json").exists():
+            runs.append(load_run(run_dir, store, trusted=trusted))
+    return ExperimentSet.model_construct(runs=runs) if trusted else ExperimentSet(runs=runs)
 
-def save_run(run: Run, export_dir: Path) -> Path:
+
+def save_run(run: Run, export_dir: Path, store: Optional[BlobStore] = None,
+             data: Optional[Dict[str, Any]] = None) -> Path:
+    """
+    Сохраняет Run в export_dir/<run.id>/run.json (компактный JSON).
+    data — уже готовый run_to_dict(run), чтобы не сериализовать Run повторно.
+    """
     run_dir = export_dir / run.id
     run_dir.mkdir(parents=True, exist_ok=True)
-    (run_dir / "run.json").write_text(run.model_dump_json(indent=2), encoding="utf-8")
-    return run_dir
\ No newline at end of file
+    store = store or _blob_store(export_dir)
+    data = data if data is not None else run_to_dict(run)
+
+    payload = {k: v for k, v in data.items() if k not in ("code", *_TEXT_FIELDS)}
+    payload["blobs"] = {
+        "code": store.put_code(data.get("code") or ""),
+        **{field: store.put(data.get(field) or "") for field in _TEXT_FIELDS},
+    }
+    (run_dir / "run.json").write_text(
+        json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+    )
+    return run_dir
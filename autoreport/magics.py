@@ -13,28 +13,33 @@ _project_root = _this_dir.parent
 if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
-try:
-    from autoreport.capture.runtime import RuntimeCapture
-    from autoreport.tracker import run_experiment
-    from autoreport.io.json_source import save_run
-    from autoreport.rendering.renderer import render_report_with_bundle
-except Exception:
-    # fallback (rare)
-    from .capture.runtime import RuntimeCapture  # type: ignore
-    from .tracker import run_experiment  # type: ignore
-    from .io.json_source import save_run  # type: ignore
-    from .rendering.renderer import render_report_with_bundle  # type: ignore
+from autoreport.capture.hooks import on_import
 
 
 @magics_class
 class AutoReportMagics(Magics):
     @line_cell_magic
     def autoreport(self, line, cell=None):
+        # Тяжёлые модули (pydantic, jinja2, matplotlib) грузим при первом вызове,
+        # чтобы %load_ext autoreport не замедлял старт ядра
+        try:
+            from autoreport.capture.runtime import RuntimeCapture
+            from autoreport.tracker import run_experiment
+            from autoreport.io.json_source import save_run, run_to_dict
+            from autoreport.rendering.renderer import render_report_with_bundle
+        except Exception:
+            # fallback (rare)
+            from .capture.runtime import RuntimeCapture  # type: ignore
+            from .tracker import run_experiment  # type: ignore
+            from .io.json_source import save_run, run_to_dict  # type: ignore
+            from .rendering.renderer import render_report_with_bundle  # type: ignore
+
         parser = ArgumentParser(prog="%%autoreport", add_help=False)
         parser.add_argument("--name", default="SmartRun")
         parser.add_argument("--template", default="default.html.j2")
         parser.add_argument("--outdir", default="reports")
         parser.add_argument("--label", default="main")
+        parser.add_argument("--inplace", action="store_true")
         args, _ = parser.parse_known_args(line.split())
 
 
@@ -48,7 +53,7 @@ class AutoReportMagics(Magics):
             code_cell = "# full notebook"
 
 
-        with RuntimeCapture() as rc:
+        with RuntimeCapture(claim_unscoped=True) as rc:
             # Выполняем тело магии (если там есть код)
             if code_cell.strip() and not code_cell.strip().startswith("# full notebook"):
                 exec(code_cell, user_ns)
@@ -77,17 +82,27 @@ class AutoReportMagics(Magics):
         )
 
 
+        # Run сериализуется один раз: тот же dict идёт и в экспорт, и в рендеринг
+        run_data = run_to_dict(run)
         export_dir = Path("export")
-        save_run(run, export_dir)
+        save_run(run, export_dir, data=run_data)
 
 
         template_dir = Path(__file__).resolve().parent / "rendering" / "templates"
-        report_dir = Path(args.outdir) / run.id
+        # --inplace: обновляем один и тот же отчёт <outdir>/<name>/ вместо нового каталога на каждый run
+        report_dir = Path(args.outdir) / (args.name if args.inplace else run.id)
         render_report_with_bundle(
-        template_dir, args.template, {"run": run.model_dump()},
-        report_dir=report_dir, bundle_mode="copy"
+        template_dir, args.template, {"run": run_data},
+        report_dir=report_dir, bundle_mode="copy", prune_assets=args.inplace
         )
         print(f"Report ready: {report_dir / 'index.html'}")
 
+def _install_figure_hooks(_pyplot):
+    from autoreport.capture.figures import install_hooks
+    install_hooks()
+
+
 def load_ipython_extension(ip):
     ip.register_magics(AutoReportMagics)
+    # Захват фигур подключается, только когда пользователь импортирует pyplot
+    on_import("matplotlib.pyplot", _install_figure_hooks)
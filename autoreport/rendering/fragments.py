@@ -0,0 +1,181 @@
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import uuid
+from jinja2 import Environment
+from markupsafe import Markup
+
+
+class FragmentCache:
+    """
+    Кэш отрендеренных фрагментов отчёта по хэшу их входных данных.
+    Держит последние max_items фрагментов в памяти и переиспользуемые — на диске
+    (<cache_dir>/<key[:2]>/<key>.html), чтобы переживать перезапуск ядра.
+    Дисковый кэш ограничен max_disk_bytes: при превышении удаляются давно не
+    использованные файлы (по mtime, который обновляется при чтении).
+    cache_dir=None — только память (например, для долгоживущего сервера).
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = Path(".autoreport_cache") / "fragments",
+                 max_items: int = 512, max_disk_bytes: int = 64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_items = max_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        # Объём дискового кэша; None — ещё не подсчитан
+        self._disk_bytes: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.html"
+
+    def get(self, key: str) -> Optional[str]:
+        html = self._memory.get(key)
+        if html is not None:
+            self._memory.move_to_end(key)
+            return html
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        if path.exists():
+            html = path.read_text(encoding="utf-8")
+            self._remember(key, html)
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return html
+
+    def put(self, key: str, html: str, persist: bool = True) -> None:
+        self._remember(key, html)
+        if self.cache_dir is None or not persist:
+            return
+        path = self._path(key)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"tmp_{uuid.uuid4().hex}.html")
+            tmp_path.write_text(html, encoding="utf-8")
+            os.replace(tmp_path, path)
+            if self._disk_bytes is None:
+                self._prune()
+            else:
+                self._disk_bytes += path.stat().st_size
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._prune()
+
+    def _prune(self) -> None:
+        """Удаляет самые старые файлы, пока кэш не займёт 3/4 от max_disk_bytes."""
+        files = []
+        for path in self.cache_dir.glob("*/*.html"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        if total > self.max_disk_bytes:
+            target = self.max_disk_bytes * 3 // 4
+            for _, size, path in sorted(files):
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+        self._disk_bytes = total
+
+    def _remember(self, key: str, html: str) -> None:
+        self._memory[key] = html
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+
+_DEFAULT_CACHE = FragmentCache()
+
+
+def fragment_key(source: str, inputs: Dict[str, Any]) -> str:
+    payload = json.dumps(inputs, sort_keys=True, default=str, ensure_ascii=False)
+    h = hashlib.sha256(source.encode("utf-8"))
+    h.update(b"\0")
+    h.update(payload.encode("utf-8"))
+    return h.hexdigest()
+
+
+class ReportSections(dict):
+    """
+    Секции отчёта (summary, models, data, metrics, logs, code), которые рендерятся
+    лениво при первом обращении из шаблона ({{ sections.metrics }}).
+    Каждый фрагмент (в т.ч. каждая карточка модели) кэшируется по хэшу
+    исходника своего шаблона и входных данных, поэтому при повторном отчёте
+    перерисовываются только изменившиеся части.
+    """
+
+    def __init__(self, env: Environment, run: Dict[str, Any], cache: Optional[FragmentCache] = None):
+        super().__init__()
+        self._env = env
+        self._run = run
+        self._cache = cache or _DEFAULT_CACHE
+
+    def _render(self, template_name: str, inputs: Dict[str, Any], persist: bool = True) -> Markup:
+        name = f"sections/{template_name}"
+        source, _, _ = self._env.loader.get_source(self._env, name)
+        key = fragment_key(source, inputs)
+        html = self._cache.get(key)
+        if html is None:
+            html = self._env.get_template(name).render(**inputs)
+            self._cache.put(key, html, persist=persist)
+        return Markup(html)
+
+    def __missing__(self, key: str) -> Markup:
+        builder = getattr(self, f"_build_{key}", None)
+        if builder is None:
+            raise KeyError(key)
+        html = builder()
+        self[key] = html
+        return html
+
+    def _models(self) -> Dict[str, Any]:
+        meta = self._run.get("meta") or {}
+        return meta.get("models") or {}
+
+    def _build_summary(self) -> Markup:
+        return self._render("summary.html.j2", {
+            "n_models": len(self._models()),
+            "n_artifacts": len(self._run.get("artifacts") or []),
+        })
+
+    def _build_models(self) -> Markup:
+        meta = self._run.get("meta") or {}
+        grouped = meta.get("grouped_metrics") or {}
+        artifacts = self._run.get("artifacts") or []
+        cards = []
+        for name, info in self._models().items():
+            figures = [a for a in artifacts
+                       if a.get("kind") == "figure" and (a.get("meta") or {}).get("model") == name]
+            cards.append(self._render("model_card.html.j2", {
+                "name": name, "info": info, "metrics": grouped.get(name, []), "figures": figures,
+            }))
+        return self._render("models.html.j2", {"cards": cards})
+
+    def _build_data(self) -> Markup:
+        meta = self._run.get("meta") or {}
+        cards = [self._render("data_profile.html.j2", {"name": name, "profile": profile})
+                 for name, profile in (meta.get("data_profiles") or {}).items()]
+        return self._render("data.html.j2", {"cards": cards})
+
+    def _build_metrics(self) -> Markup:
+        return self._render("metrics_table.html.j2", {"metrics": self._run.get("metrics") or {}})
+
+    # Логи и код — целиком от конкретного запуска и почти не повторяются между
+    # отчётами, поэтому на диск не пишутся (только в память на время сессии).
+    def _build_logs(self) -> Markup:
+        return self._render("logs.html.j2", {
+            "stdout": self._run.get("stdout", ""),
+            "stderr": self._run.get("stderr", ""),
+            "error": self._run.get("error"),
+        }, persist=False)
+
+    def _build_code(self) -> Markup:
+        return self._render("code.html.j2", {"code": self._run.get("code", "")}, persist=False)
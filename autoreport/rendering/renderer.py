@@ -1,11 +1,16 @@
 from __future__ import annotations
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from ..core.utils import normalize_context
 from datetime import datetime
-from ..io.bundle import assemble_bundle
+from ..io.bundle import assemble_bundle, link_artifacts, prune_bundle
+from .fragments import FragmentCache, ReportSections
 
+@lru_cache(maxsize=None)
 def get_env(templates_dir: Path) -> Environment:
+    # Environment кэшируется, чтобы скомпилированные шаблоны переиспользовались между отчётами
     env = Environment(
         loader=FileSystemLoader(templates_dir),
         autoescape=select_autoescape(["html", "xml"]),
@@ -16,16 +21,22 @@ def get_env(templates_dir: Path) -> Environment:
     return env
 
 def render_html(template_dir: Path, template_name: str, context: dict, out_path: Path) -> Path:
+    return _write_html(template_dir, template_name, normalize_context(context), out_path)
+
+def _write_html(template_dir: Path, template_name: str, context: dict, out_path: Path) -> Path:
     env = get_env(template_dir)
     tpl = env.get_template(template_name)
-    context = normalize_context(context)
     html = tpl.render(**context)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(html, encoding="utf-8")
+    # Не переписываем файл, если содержимое не изменилось
+    if not out_path.exists() or out_path.read_text(encoding="utf-8") != html:
+        out_path.write_text(html, encoding="utf-8")
     return out_path
 
 def render_report_with_bundle(template_dir: Path, template_name: str, context: dict,
-                              report_dir: Path, bundle_mode: str = "copy") -> Path:
+                              report_dir: Path, bundle_mode: str = "copy",
+                              prune_assets: bool = False) -> Path:
+    # prune_assets: удалить из assets/ файлы прошлых версий отчёта (перезапись на месте)
     report_dir.mkdir(parents=True, exist_ok=True)
     ctx = normalize_context(context)
     ctx.setdefault("now", datetime.now().strftime("%d.%m.%Y %H:%M"))
@@ -37,6 +48,29 @@ def render_report_with_bundle(template_dir: Path, template_name: str, context: d
         run = dict(run)
         run["artifacts"] = updated
         ctx["run"] = run
+    if prune_assets:
+        prune_bundle(report_dir, [a["path"] for a in run.get("artifacts") or []])
+    ctx.setdefault("sections", ReportSections(get_env(template_dir), run))
 
     out_path = report_dir / "index.html"
-    return render_html(template_dir, template_name, ctx, out_path)
\ No newline at end of file
+    # контекст уже нормализован выше — повторно не обходим
+    return _write_html(template_dir, template_name, ctx, out_path)
+
+def render_report_string(template_dir: Path, template_name: str, context: dict,
+                         cache: Optional[FragmentCache] = None) -> str:
+    """
+    Рендерит отчёт в строку без записи на диск; артефакты ссылаются на assets/<файл>.
+    cache — кэш фрагментов (по умолчанию общий, с записью на диск).
+    """
+    ctx = normalize_context(context)
+    ctx.setdefault("now", datetime.now().strftime("%d.%m.%Y %H:%M"))
+
+    run = ctx.get("run", {})
+    artifacts = run.get("artifacts", [])
+    if isinstance(artifacts, list) and artifacts:
+        run = dict(run)
+        run["artifacts"] = link_artifacts(artifacts)
+        ctx["run"] = run
+    env = get_env(template_dir)
+    ctx.setdefault("sections", ReportSections(env, run, cache))
+    return env.get_template(template_name).render(**ctx)
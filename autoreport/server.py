@@ -0,0 +1,268 @@
+from __future__ import annotations
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import gzip
+import hashlib
+import json
+import mimetypes
+import re
+import threading
+
+from .io.blobs import BlobStore
+from .io.json_source import load_run_dict
+from .rendering.fragments import FragmentCache
+from .rendering.renderer import get_env, render_report_string
+
+_RUN_ID_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+_TEMPLATE_DIR = Path(__file__).resolve().parent / "rendering" / "templates"
+_COMPRESSIBLE = ("text/", "application/json", "image/svg+xml")
+
+
+class _Resource:
+    """Отрендеренная страница или файл, готовый к отдаче с ETag/Last-Modified."""
+
+    def __init__(self, body: bytes, content_type: str, etag: str, mtime: float,
+                 cache_control: str = "no-cache"):
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        self.mtime = mtime
+        self.cache_control = cache_control
+        self._gzipped: Optional[bytes] = None
+
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, mtime=0)
+        return self._gzipped
+
+
+class _RenderedRun:
+    def __init__(self, page: _Resource, assets: Dict[str, Tuple[Path, Optional[str]]]):
+        self.page = page
+        self.assets = assets
+
+
+class ReportServer:
+    """
+    Рендерит отчёты прямо из export-каталога по запросу.
+    Отрендеренные страницы держатся в LRU-кэше (инвалидация по mtime run.json),
+    артефакты отдаются напрямую из контентно-адресуемого кэша.
+    Относительные пути артефактов в run.json записаны от рабочего каталога
+    ноутбука; они разрешаются от base_dir (по умолчанию — родитель export_dir).
+    """
+
+    def __init__(self, export_dir: Path = Path("export"), template_name: str = "default.html.j2",
+                 template_dir: Path = _TEMPLATE_DIR, cache_size: int = 128,
+                 base_dir: Optional[Path] = None):
+        self.export_dir = export_dir
+        self.template_name = template_name
+        self.template_dir = template_dir
+        self.cache_size = cache_size
+        self.base_dir = base_dir if base_dir is not None else export_dir.resolve().parent
+        # Сервер живёт долго: блобы кэшируются в ограниченном объёме, фрагменты —
+        # только в памяти, чтобы не засорять .autoreport_cache рабочего каталога
+        self._store = BlobStore(export_dir / "blobs", max_cache_chars=4 * 1024 * 1024)
+        self._fragments = FragmentCache(cache_dir=None, max_items=4 * cache_size)
+        self._runs: "OrderedDict[str, Tuple[int, _RenderedRun]]" = OrderedDict()
+        self._index: Optional[Tuple[Tuple[Tuple[str, int], ...], _Resource]] = None
+        self._lock = threading.Lock()
+
+    def _run_json(self, run_id: str) -> Optional[Path]:
+        if not _RUN_ID_RE.match(run_id):
+            return None
+        path = self.export_dir / run_id / "run.json"
+        return path if path.is_file() else None
+
+    def run_page(self, run_id: str) -> Optional[_RenderedRun]:
+        run_json = self._run_json(run_id)
+        if run_json is None:
+            return None
+        stat = run_json.stat()
+        with self._lock:
+            cached = self._runs.get(run_id)
+            if cached is not None and cached[0] == stat.st_mtime_ns:
+                self._runs.move_to_end(run_id)
+                return cached[1]
+
+        data = load_run_dict(run_json.parent, self._store)
+        assets = {
+            Path(a["path"]).name: (self.base_dir / a["path"], a.get("sha256"))
+            for a in data.get("artifacts") or []
+        }
+        html = render_report_string(self.template_dir, self.template_name, {"run": data},
+                                    cache=self._fragments).encode("utf-8")
+        page = _Resource(html, "text/html; charset=utf-8",
+                         f'"{hashlib.sha256(html).hexdigest()[:32]}"', stat.st_mtime)
+        rendered = _RenderedRun(page, assets)
+
+        with self._lock:
+            self._runs[run_id] = (stat.st_mtime_ns, rendered)
+            self._runs.move_to_end(run_id)
+            while len(self._runs) > self.cache_size:
+                self._runs.popitem(last=False)
+        return rendered
+
+    def asset(self, run_id: str, name: str) -> Optional[_Resource]:
+        rendered = self.run_page(run_id)
+        if rendered is None or name not in rendered.assets:
+            return None
+        path, sha = rendered.assets[name]
+        if not path.is_file():
+            return None
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        # Имя файла — его sha256, поэтому содержимое по этому URL не меняется
+        return _Resource(path.read_bytes(), content_type, f'"{sha or path.stem}"',
+                         path.stat().st_mtime, cache_control="public, max-age=31536000, immutable")
+
+    def _run_stamps(self) -> Tuple[Tuple[str, int], ...]:
+        # mtime каталога не меняется при перезаписи run.json, поэтому ключ — mtime самих файлов
+        stamps = []
+        for run_json in self.export_dir.glob("*/run.json"):
+            try:
+                stamps.append((run_json.parent.name, run_json.stat().st_mtime_ns))
+            except OSError:
+                continue
+        return tuple(sorted(stamps))
+
+    def index_page(self) -> _Resource:
+        stamps = self._run_stamps()
+        with self._lock:
+            if self._index is not None and self._index[0] == stamps:
+                return self._index[1]
+
+        runs: List[Dict[str, Any]] = []
+        for run_id, mtime_ns in stamps:
+            try:
+                data = json.loads((self.export_dir / run_id / "run.json").read_bytes())
+            except (OSError, ValueError):
+                continue
+            runs.append({k: data.get(k) for k in ("id", "name", "duration_s", "error")})
+            runs[-1]["_mtime"] = mtime_ns
+        runs.sort(key=lambda r: r["_mtime"], reverse=True)
+        mtime_ns = max((m for _, m in stamps), default=0)
+
+        html = get_env(self.template_dir).get_template("runs.html.j2").render(
+            runs=runs, export_dir=self.export_dir.as_posix()
+        ).encode("utf-8")
+        page = _Resource(html, "text/html; charset=utf-8",
+                         f'"{hashlib.sha256(html).hexdigest()[:32]}"', mtime_ns / 1e9)
+        with self._lock:
+            self._index = (stamps, page)
+        return page
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "AutoReport"
+
+    @property
+    def app(self) -> ReportServer:
+        return self.server.app  # type: ignore[attr-defined]
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def _handle(self, send_body: bool):
+        path = self.path.split("?", 1)[0]
+        parts = [p for p in path.split("/") if p]
+        try:
+            if not parts:
+                return self._send(self.app.index_page(), send_body)
+            if parts[0] == "runs" and len(parts) == 2:
+                if not path.endswith("/"):
+                    # относительные пути assets/... требуют завершающего слэша
+                    self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+                    self.send_header("Location", f"/runs/{parts[1]}/")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                rendered = self.app.run_page(parts[1])
+                return self._send(rendered.page if rendered else None, send_body)
+            if parts[0] == "runs" and len(parts) == 4 and parts[2] == "assets":
+                return self._send(self.app.asset(parts[1], parts[3]), send_body)
+        except Exception as exc:
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(exc).__name__}: {exc}")
+            return
+        self._send(None, send_body)
+
+    def _wants_gzip(self, res: _Resource) -> bool:
+        return res.content_type.startswith(_COMPRESSIBLE) and "gzip" in self.headers.get("Accept-Encoding", "")
+
+    def _not_modified(self, res: _Resource, etag: str) -> bool:
+        inm = self.headers.get("If-None-Match")
+        if inm is not None:
+            tags = [t.strip() for t in inm.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+        ims = self.headers.get("If-Modified-Since")
+        if ims:
+            try:
+                return int(res.mtime) <= parsedate_to_datetime(ims).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send(self, res: Optional[_Resource], send_body: bool):
+        if res is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        # Сжатое представление — другие байты, поэтому у него свой сильный ETag
+        gz = self._wants_gzip(res)
+        etag = f'{res.etag[:-1]}-gz"' if gz else res.etag
+        headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(res.mtime, usegmt=True),
+            "Cache-Control": res.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if self._not_modified(res, etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            return
+
+        body = res.body
+        if gz:
+            body = res.gzipped()
+            headers["Content-Encoding"] = "gzip"
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", res.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(export_dir: Path = Path("export"), host: str = "127.0.0.1", port: int = 8000,
+                template_name: str = "default.html.j2", cache_size: int = 128,
+                base_dir: Optional[Path] = None) -> ThreadingHTTPServer:
+    httpd = ThreadingHTTPServer((host, port), _Handler)
+    httpd.app = ReportServer(export_dir, template_name=template_name, cache_size=cache_size,  # type: ignore[attr-defined]
+                             base_dir=base_dir)
+    return httpd
+
+
+def serve(export_dir: Path = Path("export"), host: str = "127.0.0.1", port: int = 8000,
+          template_name: str = "default.html.j2", cache_size: int = 128,
+          base_dir: Optional[Path] = None) -> None:
+    httpd = make_server(export_dir, host, port, template_name, cache_size, base_dir)
+    print(f"Serving {export_dir} at http://{host}:{httpd.server_address[1]}/")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
@@ -2,13 +2,29 @@ from __future__ import annotations
 from typing import Any, Dict, Optional
 from pathlib import Path
 from .core.models import Run, Metric, Artifact
+from .capture.runtime import RuntimeCapture
 from .tracker import run_experiment
 
 class Session:
+    """
+    Программный запуск эксперимента. Внутри `with session:` захватываются
+    stdout/stderr, фигуры и длительность — только этого запуска, даже если
+    другие сессии параллельно работают в соседних потоках.
+    """
+
     def __init__(self, name: str = "Session"):
         self.name = name
         self.namespace: Dict[str, Any] = {}
         self.params: Dict[str, Any] = {}
+        self._capture: Optional[RuntimeCapture] = None
+
+    def __enter__(self) -> "Session":
+        self._capture = RuntimeCapture()
+        self._capture.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._capture.__exit__(exc_type, exc, tb)
 
     def log_predictions(self, y_true, y_pred, y_prob=None, label: str = "main"):
         self.namespace[f"y_true_{label}"] = y_true
@@ -19,8 +35,16 @@ class Session:
     def log_params(self, params: Dict[str, Any]):
         self.params.update(params)
 
-    def finalize(self, code: str = "# session", stdout: str = "", stderr: str = "", error: Optional[str] = None, duration_s: float = 0.0) -> Run:
-        run = run_experiment(code=code, namespace=self.namespace, run_name=self.name, stdout=stdout, stderr=stderr, error=error, duration_s=duration_s)
+    def finalize(self, code: str = "# session", stdout: str = "", stderr: str = "", error: Optional[str] = None, duration_s: float = 0.0, run_id: Optional[str] = None) -> Run:
+        rc = self._capture
+        artifacts = None
+        if rc is not None and hasattr(rc, "duration_s"):
+            stdout = stdout or rc.stdout
+            stderr = stderr or rc.stderr
+            error = error or rc.error
+            duration_s = duration_s or rc.duration_s
+            artifacts = rc.artifacts
+        run = run_experiment(code=code, namespace=self.namespace, run_name=self.name, stdout=stdout, stderr=stderr, error=error, duration_s=duration_s, artifacts=artifacts, run_id=run_id)
         run.params = self.params
         return run
 
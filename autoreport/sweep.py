@@ -0,0 +1,217 @@
+from __future__ import annotations
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from multiprocessing.connection import wait as wait_sentinels
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+import hashlib
+import inspect
+import itertools
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+from .core.models import Run, ExperimentSet
+from .io.json_source import save_run, load_run
+from .session import Session
+
+ParamGrid = Union[Mapping[str, Iterable[Any]], Iterable[Mapping[str, Any]]]
+
+# Запас сверх timeout, после которого родитель завершает процесс конфигурации
+_TIMEOUT_GRACE_S = 5.0
+
+
+def expand_grid(param_grid: ParamGrid) -> List[Dict[str, Any]]:
+    """
+    Разворачивает сетку параметров в список конфигураций.
+    Принимает dict {param: [values]} (декартово произведение) или список таких dict,
+    как sklearn.model_selection.ParameterGrid.
+    """
+    grids = [param_grid] if isinstance(param_grid, Mapping) else list(param_grid)
+    configs: List[Dict[str, Any]] = []
+    for grid in grids:
+        keys = sorted(grid)
+        for values in itertools.product(*(list(grid[k]) for k in keys)):
+            configs.append(dict(zip(keys, values)))
+    return configs
+
+
+def config_id(name: str, params: Dict[str, Any]) -> str:
+    """Детерминированный id запуска: одна и та же конфигурация -> тот же run_id."""
+    payload = json.dumps({"name": name, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:10]
+
+
+@contextmanager
+def _time_limit(timeout: Optional[float]):
+    # Лимит через SIGALRM: доступен только на POSIX и в главном потоке процесса-воркера
+    if not timeout or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _on_timeout(signum, frame):
+        raise TimeoutError(f"превышен лимит времени {timeout} c")
+
+    previous = signal.signal(signal.SIGALRM, _on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _source_of(fn: Callable) -> str:
+    try:
+        return inspect.getsource(fn)
+    except (OSError, TypeError):
+        return "# sweep"
+
+
+def _run_config(train_fn: Callable, params: Dict[str, Any], name: str, run_id: str,
+                export_dir: Path, timeout: Optional[float]) -> str:
+    """Выполняется в процессе-воркере: одна конфигурация -> один Run в export_dir."""
+    session = Session(name=name)
+    session.log_params(params)
+    try:
+        with session, _time_limit(timeout):
+            result = train_fn(session, **params)
+            if isinstance(result, dict):
+                session.namespace.update(result)
+    except Exception:
+        pass  # ошибка уже записана RuntimeCapture в session
+    run = session.finalize(code=_source_of(train_fn), run_id=run_id)
+    save_run(run, export_dir)
+    return run_id
+
+
+def _is_done(export_dir: Path, run_id: str) -> bool:
+    """Конфигурация уже выполнена успешно: run.json есть и ошибки в нём нет."""
+    run_json = export_dir / run_id / "run.json"
+    if not run_json.exists():
+        return False
+    try:
+        return json.loads(run_json.read_bytes()).get("error") is None
+    except (OSError, ValueError):
+        return False
+
+
+def _save_failed(export_dir: Path, run_id: str, name: str, params: Dict[str, Any], error: str) -> None:
+    save_run(Run(id=run_id, name=name, params=params, error=error), export_dir)
+
+
+def _run_pending(train_fn: Callable, pending: List[Tuple[str, Dict[str, Any]]], name: str,
+                 export_dir: Path, workers: int, timeout: Optional[float]) -> None:
+    """
+    Выполняет конфигурации, каждую в собственном процессе, не больше workers одновременно.
+    Срок отсчитывается от старта процесса конкретной конфигурации: просроченный процесс
+    завершается (SIGALRM не прерывает нативный код), остальные продолжают работу,
+    а ещё не начатые конфигурации ждут свободного слота.
+    """
+    ctx = multiprocessing.get_context()
+    queue: Deque[Tuple[str, Dict[str, Any]]] = deque(pending)
+    # процесс -> (run_id, params, срок по time.monotonic())
+    running: Dict[Any, Tuple[str, Dict[str, Any], Optional[float]]] = {}
+    limit = timeout + _TIMEOUT_GRACE_S if timeout else None
+    try:
+        while queue or running:
+            while queue and len(running) < workers:
+                rid, params = queue.popleft()
+                proc = ctx.Process(target=_run_config,
+                                   args=(train_fn, params, name, rid, export_dir, timeout))
+                try:
+                    proc.start()
+                except Exception as exc:
+                    # Например, train_fn не сериализуется для spawn/forkserver
+                    _save_failed(export_dir, rid, name, params, f"{type(exc).__name__}: {exc}")
+                    continue
+                running[proc] = (rid, params, time.monotonic() + limit if limit else None)
+            if not running:
+                continue
+
+            deadlines = [d for _, _, d in running.values() if d is not None]
+            wait_s = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            wait_sentinels([proc.sentinel for proc in running], timeout=wait_s)
+
+            now = time.monotonic()
+            for proc, (rid, params, deadline) in list(running.items()):
+                if proc.exitcode is not None:
+                    # Воркер упал целиком, не успев сохранить Run
+                    if proc.exitcode != 0:
+                        _save_failed(export_dir, rid, name, params,
+                                     f"RuntimeError: воркер завершился с кодом {proc.exitcode}")
+                elif deadline is not None and now >= deadline:
+                    proc.terminate()
+                    proc.join()
+                    _save_failed(export_dir, rid, name, params,
+                                 f"TimeoutError: воркер не завершился за {limit:.0f} c")
+                else:
+                    continue
+                proc.join()
+                del running[proc]
+    finally:
+        # Прерывание (например, KeyboardInterrupt) не оставляет воркеров-сирот
+        for proc in running:
+            proc.terminate()
+            proc.join()
+
+
+def _comparison_context(experiments: ExperimentSet) -> Dict[str, Any]:
+    metric_keys = sorted({k for r in experiments.runs for k in r.metrics})
+    best: Dict[str, str] = {}
+    for key in metric_keys:
+        scored = [r for r in experiments.runs if key in r.metrics]
+        if scored:
+            direction = scored[0].metrics[key].direction
+            pick = min if direction == "min" else max
+            best[key] = pick(scored, key=lambda r: r.metrics[key].value).id
+    return {
+        "experiments": experiments.model_dump(mode="json"),
+        "metric_keys": metric_keys,
+        "best": best,
+        "now": datetime.now().strftime("%d.%m.%Y %H:%M"),
+    }
+
+
+def run_sweep(train_fn: Callable[..., Optional[Dict[str, Any]]], param_grid: ParamGrid,
+              name: str = "Sweep", export_dir: Path = Path("export"), outdir: Path = Path("reports"),
+              max_workers: Optional[int] = None, timeout: Optional[float] = None,
+              resume: bool = True, template: str = "comparison.html.j2") -> ExperimentSet:
+    """
+    Запускает train_fn(session, **params) для каждой конфигурации сетки в отдельных
+    процессах, не больше max_workers одновременно.
+
+    Каждый воркер работает со своей Session и сохраняет Run через save_run в export_dir.
+    train_fn должна быть определена на уровне модуля (её нужно передать в другой процесс);
+    возвращённый ею dict с метриками добавляется в namespace сессии.
+    При resume=True пропускаются конфигурации, уже успешно сохранённые в export_dir;
+    запуски с ошибкой (в т.ч. по таймауту) выполняются заново.
+    timeout ограничивает одну конфигурацию: внутри воркера через SIGALRM (POSIX), а
+    родитель завершает процесс конфигурации, не уложившейся в timeout (+ запас) с момента
+    своего старта, — SIGALRM не прерывает нативный код. Остальные конфигурации это не
+    затрагивает. Без timeout зависшая конфигурация занимает свой слот до конца перебора.
+    По завершении строится общий отчёт сравнения в outdir/sweep_<name>/index.html.
+    """
+    export_dir = Path(export_dir)
+    configs = [(config_id(name, params), params) for params in expand_grid(param_grid)]
+    pending = [(rid, params) for rid, params in configs
+               if not (resume and _is_done(export_dir, rid))]
+
+    if pending:
+        _run_pending(train_fn, pending, name, export_dir, max_workers or os.cpu_count() or 1, timeout)
+
+    experiments = ExperimentSet(
+        runs=[load_run(export_dir / rid, trusted=True) for rid, _ in configs],
+        context={"sweep": name},
+    )
+
+    from .rendering.renderer import render_html
+    template_dir = Path(__file__).resolve().parent / "rendering" / "templates"
+    report_path = render_html(template_dir, template, _comparison_context(experiments),
+                              Path(outdir) / f"sweep_{name}" / "index.html")
+    print(f"Sweep report ready: {report_path}")
+    return experiments
@@ -8,6 +8,9 @@ from .capture.runtime import RuntimeCapture
 from .capture.lineage import build_lineage_from_code, classify_variables
 from .core.models import Run, Artifact, Metric
 from .capture.lineage import extract_plot_variable_mapping
+from .capture.variables import discover_data_variables
+from .capture.profiling import profile_namespace
+from .core.utils import fingerprint
 
 
 def _model_info(obj: Any) -> Dict[str, Any]:
@@ -27,10 +30,11 @@ def _model_info(obj: Any) -> Dict[str, Any]:
 
 def run_experiment(code: str, namespace: Dict[str, Any], run_name: str,
                    stdout: str, stderr: str, error: str | None, duration_s: float,
-                   artifacts: Optional[List[Artifact]] = None) -> Run:
+                   artifacts: Optional[List[Artifact]] = None,
+                   run_id: Optional[str] = None) -> Run:
     """Создаёт Run с AST-based lineage tracking."""
     
-    run_id = uuid.uuid4().hex[:10]
+    run_id = run_id or uuid.uuid4().hex[:10]
     
     # 1. AST-анализ: строим граф зависимостей
     graph = build_lineage_from_code(code)
@@ -46,12 +50,11 @@ def run_experiment(code: str, namespace: Dict[str, Any], run_name: str,
     
     # 3. Обработка артефактов
     if artifacts is None:
-        from .capture.figures import FigureManager, _GLOBAL_FIG_BUFFER
-        fm = FigureManager()
-        arts_now = fm.capture_current_figures()
-        all_arts = list({a.path: a for a in (arts_now + _GLOBAL_FIG_BUFFER)}.values())
-        artifacts = all_arts
-        _GLOBAL_FIG_BUFFER.clear()  # КРИТИЧНО!
+        # Вне запуска забираем «ничьи» фигуры, внутри — только фигуры текущего запуска
+        from .capture.figures import collect_figures
+        from .capture.context import current_capture
+        state = current_capture()
+        artifacts = collect_figures(state, claim_unscoped=state is None)
     else:
         normalized = []
         for a in artifacts:
@@ -110,7 +113,16 @@ def run_experiment(code: str, namespace: Dict[str, Any], run_name: str,
                         "key": full_key, "name": subk, "value": float(subv)
                     })
     
-    # 5. Собираем Run
+    # 5. Профили и отпечатки данных/моделей (выборочные, с кэшем)
+    data_vars = discover_data_variables(namespace)
+    data_fingerprints = {k: fingerprint(namespace[k]) for k in data_vars}
+    data_profiles = profile_namespace(namespace, data_vars, fingerprints=data_fingerprints)
+    fingerprints = {
+        "data": data_fingerprints,
+        "models": {k: fingerprint(v) for k, v in models.items()},
+    }
+    
+    # 6. Собираем Run
     run = Run(
         id=run_id, name=run_name, duration_s=duration_s, params={},
         metrics=metrics, series={}, artifacts=artifacts,
@@ -118,7 +130,9 @@ def run_experiment(code: str, namespace: Dict[str, Any], run_name: str,
         meta={
             "models": models_meta,
             "grouped_metrics": grouped_metrics,
-            "lineage_graph": {k: list(v.assigned_from) for k, v in graph.nodes.items()}
+            "lineage_graph": {k: list(v.assigned_from) for k, v in graph.nodes.items()},
+            "data_profiles": data_profiles,
+            "fingerprints": fingerprints,
         }
     )
     return run
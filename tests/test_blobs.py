@@ -0,0 +1,55 @@
+import json
+import threading
+
+from autoreport.core.models import Run
+from autoreport.io.blobs import BlobStore, split_cells
+from autoreport.io.json_source import load_run, save_run
+
+CODE = "# === Cell 1 ===\nimport numpy as np\n\n# === Cell 2 ===\nx = np.zeros(3)\n"
+
+
+def test_save_load_round_trip_stores_text_in_blobs(tmp_path):
+    run = Run(id="r1", name="blobs", code=CODE, stdout="out\n" * 100, stderr="warn")
+    save_run(run, tmp_path)
+
+    payload = json.loads((tmp_path / "r1" / "run.json").read_text(encoding="utf-8"))
+    assert "code" not in payload and "stdout" not in payload
+    assert len(payload["blobs"]["code"]) == 2
+
+    loaded = load_run(tmp_path / "r1")
+    assert (loaded.code, loaded.stdout, loaded.stderr) == (run.code, run.stdout, run.stderr)
+
+
+def test_unchanged_cells_are_stored_once(tmp_path):
+    save_run(Run(id="a", name="a", code=CODE), tmp_path)
+    save_run(Run(id="b", name="b", code=CODE + "# === Cell 3 ===\ny = 1\n"), tmp_path)
+    assert len(list((tmp_path / "blobs").glob("*/*.z"))) == 3
+    assert "".join(split_cells(CODE)) == CODE
+
+
+def test_legacy_inline_run_json_still_loads(tmp_path):
+    (tmp_path / "old").mkdir()
+    (tmp_path / "old" / "run.json").write_text(json.dumps(
+        {"id": "old", "name": "legacy", "code": "x = 1", "stdout": "hi", "stderr": ""}
+    ), encoding="utf-8")
+    loaded = load_run(tmp_path / "old")
+    assert (loaded.code, loaded.stdout) == ("x = 1", "hi")
+
+
+def test_concurrent_put_of_same_blob(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    errors = []
+
+    def put():
+        try:
+            store.put("same text " * 1000)
+        except Exception as exc:  # pragma: no cover - сообщение для диагностики
+            errors.append(exc)
+
+    threads = [threading.Thread(target=put) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert [p.name.startswith("tmp_") for p in (tmp_path / "blobs").glob("*/*")] == [False]
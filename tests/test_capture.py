@@ -0,0 +1,40 @@
+import threading
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+from autoreport.capture.runtime import RuntimeCapture  # noqa: E402
+from autoreport.session import get_session  # noqa: E402
+
+
+def _run(k, results):
+    with get_session(f"run_{k}") as session:
+        print(f"hello from {k}")
+        for i in range(3):
+            _, ax = plt.subplots()
+            ax.plot([k, i, k * i + 100 * k])
+    rc = session._capture
+    results[k] = (rc.stdout, {a.sha256 for a in rc.artifacts})
+
+
+def test_parallel_runs_do_not_share_output_or_figures(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    results = {}
+    threads = [threading.Thread(target=_run, args=(k, results)) for k in (1, 2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    (out1, figs1), (out2, figs2) = results[1], results[2]
+    assert out1 == "hello from 1\n" and out2 == "hello from 2\n"
+    assert len(figs1) == 3 and len(figs2) == 3
+    assert not figs1 & figs2
+
+    # фигуры завершённых запусков закрыты и не достаются следующему захвату ноутбука
+    assert plt.get_fignums() == []
+    with RuntimeCapture(claim_unscoped=True) as rc:
+        pass
+    assert rc.artifacts == []
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from autoreport.core import utils
+from autoreport.core.utils import fingerprint
+
+
+class _CountingHash:
+    def __init__(self):
+        self.nbytes = 0
+
+    def update(self, data):
+        self.nbytes += memoryview(data).nbytes
+
+
+def test_fingerprint_is_stable_for_equal_data():
+    a = np.arange(1000.0).reshape(100, 10)
+    assert fingerprint(a) == fingerprint(a.copy())
+    assert fingerprint(a) != fingerprint(a + 1)
+
+
+def test_fingerprint_detects_in_place_edit():
+    a = np.zeros((1000, 10))
+    before = fingerprint(a)
+    a[500, 5] = 123
+    assert fingerprint(a) != before
+
+    df = pd.DataFrame({"x": np.zeros(1000), "s": ["a"] * 1000})
+    before = fingerprint(df)
+    df.iloc[500, 0] = 3.0
+    assert fingerprint(df) != before
+
+
+def test_wide_frame_respects_total_budget():
+    df = pd.DataFrame(np.random.default_rng(0).random((20_000, 400)))  # ~64 МБ
+    h = _CountingHash()
+    utils._hash_value(h, df, 4 * 1024 * 1024)
+    assert h.nbytes < 8 * 1024 * 1024
@@ -0,0 +1,38 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Бюджет на импорт autoreport и autoreport.magics. IPython в ядре уже загружен,
+# поэтому он импортируется до начала замера.
+IMPORT_BUDGET_S = 0.1
+HEAVY_MODULES = ("pydantic", "jinja2", "matplotlib", "numpy")
+
+_PROBE = """
+import json, sys, time
+import IPython.core.magic
+start = time.perf_counter()
+import autoreport
+import autoreport.magics
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _probe():
+    out = subprocess.run([sys.executable, "-c", _PROBE], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def test_import_is_fast():
+    result = _probe()
+    assert result["elapsed"] < IMPORT_BUDGET_S, f"импорт занял {result['elapsed']:.3f} c"
+
+
+def test_import_skips_heavy_dependencies():
+    modules = set(_probe()["modules"])
+    loaded = [m for m in HEAVY_MODULES if m in modules]
+    assert not loaded, f"тяжёлые зависимости импортированы при загрузке: {loaded}"
@@ -0,0 +1,43 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from autoreport.core.models import Artifact, Metric, Run
+from autoreport.io.json_source import load_experiment_set, load_run, run_to_dict, save_run
+
+
+def _run():
+    return Run(
+        id="r1", name="serialize", started_at=datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc),
+        metrics={"acc": Metric(name="acc", value=0.9)},
+        artifacts=[Artifact(name="figure_1", path="a/b.png", sha256="b")],
+        code="x = 1", stdout="hi",
+    )
+
+
+def test_trusted_and_validated_load_agree(tmp_path):
+    run = _run()
+    save_run(run, tmp_path, data=run_to_dict(run))
+
+    validated = load_run(tmp_path / "r1")
+    trusted = load_run(tmp_path / "r1", trusted=True)
+    assert run_to_dict(trusted) == run_to_dict(validated) == run_to_dict(run)
+    assert isinstance(trusted.metrics["acc"], Metric)
+    assert trusted.started_at == run.started_at
+
+    experiments = load_experiment_set(tmp_path, trusted=True)
+    assert [r.id for r in experiments.runs] == ["r1"]
+
+
+def test_only_validated_load_rejects_malformed_file(tmp_path):
+    save_run(_run(), tmp_path)
+    path = tmp_path / "r1" / "run.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["metrics"]["acc"]["value"] = "not a number"
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    with pytest.raises(ValidationError):
+        load_run(tmp_path / "r1")
+    assert load_run(tmp_path / "r1", trusted=True).metrics["acc"].value == "not a number"
@@ -0,0 +1,43 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from autoreport.capture.profiling import profile_data, profile_namespace
+
+
+def test_profile_reflects_in_place_edit():
+    b = np.zeros((1000, 3))
+    assert profile_data(b)["columns"][0]["stats"]["mean"] == 0.0
+    b[100:200] = 5
+    assert profile_data(b)["columns"][0]["stats"]["mean"] == 0.5
+
+
+def test_wide_frame_stays_within_budget():
+    df = pd.DataFrame(np.random.default_rng(0).random((50_000, 1500)))
+    budget = 0.3
+    start = time.perf_counter()
+    profile = profile_data(df, time_budget_s=budget)
+    elapsed = time.perf_counter() - start
+
+    assert profile["truncated"]
+    assert elapsed < budget + 0.5
+    assert profile["elapsed_s"] < budget + 0.5
+    # необработанные колонки сохраняют имя и dtype
+    assert len(profile["columns"]) == 1500
+    assert profile["columns"][-1]["name"] == "1499"
+    assert profile["columns"][-1]["dtype"] == "float64"
+
+    # частичный профиль кэшируется: повторный отчёт не упирается в бюджет снова
+    start = time.perf_counter()
+    assert profile_data(df, time_budget_s=budget) is profile
+    assert time.perf_counter() - start < budget
+
+
+def test_profile_namespace_reuses_fingerprints():
+    ns = {"df": pd.DataFrame({"x": [1.0, 2.0, None], "s": ["a", "b", None]})}
+    profiles = profile_namespace(ns, ["df"], fingerprints={"df": "precomputed"})
+    cols = {c["name"]: c for c in profiles["df"]["columns"]}
+    assert cols["x"]["stats"]["mean"] == 1.5
+    assert cols["s"]["n_unique"] == 2
+    assert profile_data(ns["df"], fingerprint="precomputed") is profiles["df"]
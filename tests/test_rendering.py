@@ -0,0 +1,55 @@
+import os
+from pathlib import Path
+
+from autoreport.rendering.fragments import FragmentCache, ReportSections, fragment_key
+from autoreport.rendering.renderer import get_env, render_report_with_bundle
+
+TEMPLATE_DIR = Path(__file__).resolve().parents[1] / "autoreport" / "rendering" / "templates"
+
+
+def _run(metrics, artifacts=()):
+    return {
+        "id": "r1", "name": "test", "duration_s": 1.0, "metrics": metrics,
+        "artifacts": list(artifacts), "code": "x = 1", "stdout": "", "stderr": "", "meta": {},
+    }
+
+
+def test_fragment_cache_hit_skips_rendering(tmp_path):
+    cache = FragmentCache(tmp_path / "fragments")
+    env = get_env(TEMPLATE_DIR)
+    run = _run({"acc": {"name": "acc", "value": 0.9}})
+    first = str(ReportSections(env, run, cache)["metrics"])
+
+    source, _, _ = env.loader.get_source(env, "sections/metrics_table.html.j2")
+    key = fragment_key(source, {"metrics": run["metrics"]})
+    cache.put(key, "<cached/>")
+    assert str(ReportSections(env, run, cache)["metrics"]) == "<cached/>"
+
+    # новый процесс (пустая память) читает фрагмент с диска; код и логи на диск не пишутся
+    fresh = FragmentCache(tmp_path / "fragments")
+    assert fresh.get(key) == first
+    str(ReportSections(env, run, fresh)["code"])
+    assert len(list((tmp_path / "fragments").glob("*/*.html"))) == 1
+
+
+def test_disk_cache_is_bounded(tmp_path):
+    cache = FragmentCache(tmp_path / "fragments", max_disk_bytes=20_000)
+    for i in range(50):
+        cache.put(f"{i:064x}", "x" * 1000)
+    total = sum(p.stat().st_size for p in (tmp_path / "fragments").glob("*/*.html"))
+    assert total <= 20_000
+
+
+def test_inplace_report_prunes_stale_assets(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # общий кэш фрагментов пишет в ./.autoreport_cache
+    report_dir = tmp_path / "report"
+    arts = []
+    for name in ("a.png", "b.png"):
+        src = tmp_path / name
+        src.write_bytes(os.urandom(16))
+        arts.append({"name": name, "path": str(src), "kind": "figure"})
+
+    render_report_with_bundle(TEMPLATE_DIR, "default.html.j2", {"run": _run({}, arts)}, report_dir)
+    render_report_with_bundle(TEMPLATE_DIR, "default.html.j2", {"run": _run({}, arts[1:])}, report_dir,
+                              prune_assets=True)
+    assert sorted(p.name for p in (report_dir / "assets").iterdir()) == ["b.png"]
@@ -0,0 +1,73 @@
+import gzip
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from autoreport.core.models import Artifact, Run
+from autoreport.io.json_source import save_run
+from autoreport.server import make_server
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    (project / ".autoreport_cache" / "artifacts").mkdir(parents=True)
+    png = project / ".autoreport_cache" / "artifacts" / "ab.png"
+    png.write_bytes(b"\x89PNG" + os.urandom(32))
+    export_dir = project / "export"
+    save_run(Run(id="r1", name="first", code="x = 1", artifacts=[
+        Artifact(name="figure_1", path=".autoreport_cache/artifacts/ab.png", sha256="ab"),
+    ]), export_dir)
+
+    # сервер запускается из другого каталога: пути артефактов не зависят от CWD
+    other = tmp_path / "elsewhere"
+    other.mkdir()
+    monkeypatch.chdir(other)
+    httpd = make_server(export_dir, port=0)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", export_dir
+    httpd.shutdown()
+    httpd.server_close()
+    assert not (other / ".autoreport_cache").exists()
+
+
+def _get(url, **headers):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as r:
+            return r.status, r.headers, r.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, b""
+
+
+def test_conditional_requests_and_gzip_etag(server):
+    base, _ = server
+    status, headers, body = _get(f"{base}/runs/r1/")
+    assert status == 200 and b"first" in body
+    etag = headers["ETag"]
+    assert _get(f"{base}/runs/r1/", **{"If-None-Match": etag})[0] == 304
+
+    status, gz_headers, gz_body = _get(f"{base}/runs/r1/", **{"Accept-Encoding": "gzip"})
+    assert gz_headers["Content-Encoding"] == "gzip" and gzip.decompress(gz_body) == body
+    assert gz_headers["ETag"] != etag
+    assert _get(f"{base}/runs/r1/", **{"If-None-Match": gz_headers["ETag"], "Accept-Encoding": "gzip"})[0] == 304
+    # тег сжатого представления не подходит несжатому
+    assert _get(f"{base}/runs/r1/", **{"If-None-Match": gz_headers["ETag"]})[0] == 200
+
+
+def test_asset_and_index_refresh(server):
+    base, export_dir = server
+    status, headers, _ = _get(f"{base}/runs/r1/assets/ab.png")
+    assert status == 200 and "immutable" in headers["Cache-Control"]
+
+    assert b"first" in _get(f"{base}/")[2]
+    run_json = export_dir / "r1" / "run.json"
+    data = json.loads(run_json.read_text(encoding="utf-8"))
+    data["name"] = "renamed"
+    run_json.write_text(json.dumps(data), encoding="utf-8")
+    stat = run_json.stat()
+    os.utime(run_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert b"renamed" in _get(f"{base}/")[2]
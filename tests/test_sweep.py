@@ -0,0 +1,51 @@
+import signal
+import time
+import uuid
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from autoreport import sweep  # noqa: E402
+from autoreport.sweep import run_sweep  # noqa: E402
+
+
+def train(session, x, state_dir):
+    state = Path(state_dir)
+    (state / f"call_{x}_{uuid.uuid4().hex}").touch()
+    healed = (state / "healed").exists()
+    if x == 1 and not healed:
+        # имитация нативного кода, который не реагирует на SIGALRM
+        signal.signal(signal.SIGALRM, signal.SIG_IGN)
+        time.sleep(60)
+    if x == 2 and not healed:
+        raise ValueError("transient")
+    return {"score": float(x)}
+
+
+def _calls(state: Path, x: int) -> int:
+    return len(list(state.glob(f"call_{x}_*")))
+
+
+def test_hung_worker_is_killed_and_resume_reruns_only_failed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # воркеры пишут фигуры в ./.autoreport_cache
+    monkeypatch.setattr(sweep, "_TIMEOUT_GRACE_S", 0.5)
+    state = tmp_path / "state"
+    state.mkdir()
+    grid = {"x": [1, 2, 3], "state_dir": [str(state)]}
+    kwargs = dict(name="t", export_dir=tmp_path / "export", outdir=tmp_path / "reports",
+                  max_workers=1, timeout=0.5)
+
+    # Один слот: зависшая конфигурация не должна мешать остальным
+    runs = {r.params["x"]: r for r in run_sweep(train, grid, **kwargs).runs}
+    assert runs[1].error.startswith("TimeoutError")
+    assert runs[2].error == "ValueError: transient"
+    assert runs[3].error is None
+
+    (state / "healed").touch()
+    runs = {r.params["x"]: r for r in run_sweep(train, grid, **kwargs).runs}
+    assert all(r.error is None for r in runs.values())
+    assert runs[1].metrics["score"].value == 1.0
+    # успешная конфигурация при resume не перезапускается
+    assert (_calls(state, 1), _calls(state, 2), _calls(state, 3)) == (2, 2, 1)